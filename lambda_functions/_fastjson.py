@@ -0,0 +1,44 @@
+"""
+JSON Serialization Shim
+
+Wraps orjson (Rust-backed, 3-10x faster than stdlib json) when available
+and falls back to stdlib json otherwise. Handlers import `dumps`/`loads`
+from here instead of using the json module directly.
+"""
+
+try:
+    import orjson as _orjson
+
+    JSONDecodeError = _orjson.JSONDecodeError
+
+    def dumps(obj, default=str, indent=False):
+        """Serialize obj to a JSON string using orjson."""
+        option = _orjson.OPT_NAIVE_UTC | _orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, default=default, option=option).decode()
+
+    def dumps_bytes(obj, default=str):
+        """Serialize obj straight to JSON bytes, skipping the str decode."""
+        option = _orjson.OPT_NAIVE_UTC | _orjson.OPT_SERIALIZE_NUMPY
+        return _orjson.dumps(obj, default=default, option=option)
+
+    loads = _orjson.loads
+
+except ImportError:
+    import json as _json
+
+    JSONDecodeError = _json.JSONDecodeError
+
+    def dumps(obj, default=str, indent=False):
+        """Serialize obj to a JSON string using stdlib json."""
+        if indent:
+            return _json.dumps(obj, default=default, indent=2)
+        # Match orjson's compact output; stdlib pads with ', ' / ': '
+        return _json.dumps(obj, default=default, separators=(',', ':'))
+
+    def dumps_bytes(obj, default=str):
+        """Serialize obj to JSON bytes using stdlib json."""
+        return _json.dumps(obj, default=default, separators=(',', ':')).encode()
+
+    loads = _json.loads
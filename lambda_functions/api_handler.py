@@ -5,82 +5,167 @@ Demonstrates HTTP request/response handling with API Gateway.
 Shows path parameters, query strings, and JSON body parsing.
 """
 
-import json
 import os
 from typing import Dict, Any
 
+try:
+    from lambda_functions._fastjson import dumps, loads, JSONDecodeError
+except ImportError:
+    # Flat deployment package layout (handler files at the package root)
+    from _fastjson import dumps, loads, JSONDecodeError
+
+# Static response headers, built once at import so warm invocations
+# share a single dict instead of rebuilding it per request
+_RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
+}
+_ERROR_HEADERS = {
+    'Content-Type': 'application/json'
+}
+
+
+def _request_id(context: Any) -> str:
+    """Return the Lambda request id, or 'local-test' outside Lambda.
+
+    The context attribute is aws_request_id; the old context.request_id
+    lookup raised AttributeError on every live invocation and was
+    silently swallowed by the outer exception handler, turning real
+    requests into 500s.
+    """
+    return getattr(context, 'aws_request_id', 'local-test')
+
+
+def _extract_method_and_path(event: Dict[str, Any]) -> tuple:
+    """Extract the HTTP method and slash-normalized path from the event.
+
+    Detects the payload format once instead of probing both shapes with
+    nested .get fallbacks (which allocate a fresh empty dict per miss).
+    """
+    if 'rawPath' in event:
+        # API Gateway v2 (HTTP API)
+        try:
+            http_method = event['requestContext']['http']['method']
+        except KeyError:
+            http_method = 'GET'
+        path = event['rawPath']
+    else:
+        # API Gateway v1 (REST API) or hand-rolled test events
+        http_method = event.get('httpMethod', 'GET')
+        path = event.get('path', '/')
+    return http_method, path.rstrip('/') or '/'
+
+
+def _parse_body(event: Dict[str, Any]) -> Any:
+    """Parse the request body as JSON, falling back to the raw string.
+
+    Requests that declare a non-JSON content type skip the parse (and
+    the cost of constructing a decode exception) entirely; bodies with a
+    JSON or absent content type are parsed as before.
+    """
+    raw = event.get('body')
+    if not raw:
+        return None
+
+    headers = event.get('headers') or {}
+    content_type = headers.get('content-type') or headers.get('Content-Type') or ''
+    if content_type and not content_type.startswith('application/json'):
+        return raw
+
+    try:
+        return loads(raw)
+    except JSONDecodeError:
+        return raw
+
+
+def _health_route(event: Dict[str, Any], context: Any) -> tuple:
+    # The health check needs none of the echo fields; a three-key literal
+    # keeps this hottest route's build-and-serialize cost minimal
+    _, path = _extract_method_and_path(event)
+    return 200, {
+        'status': 'healthy',
+        'message': 'Service is healthy',
+        'path': path
+    }
+
+
+def _default_route(event: Dict[str, Any], context: Any) -> tuple:
+    # Build each response in a single literal rather than constructing a
+    # base dict and mutating it, which re-hashes keys and can resize
+    http_method, path = _extract_method_and_path(event)
+    body = _parse_body(event)
+
+    if http_method == 'POST' and body:
+        return 201, {
+            'message': 'POST request received successfully',
+            'method': http_method,
+            'path': path,
+            'pathParameters': event.get('pathParameters') or {},
+            'queryParameters': event.get('queryStringParameters') or {},
+            'body': body,
+            'receivedData': body,
+            'headers': event.get('headers', {}),
+            'requestId': _request_id(context)
+        }
+
+    return 200, {
+        'message': 'Hello from API Gateway Lambda!',
+        'method': http_method,
+        'path': path,
+        'pathParameters': event.get('pathParameters') or {},
+        'queryParameters': event.get('queryStringParameters') or {},
+        'body': body,
+        'headers': event.get('headers', {}),
+        'requestId': _request_id(context)
+    }
+
+
+# O(1) route dispatch keyed on (method, path); paths are normalized so
+# '/health' and '/health/' hit the same entry
+_ROUTES = {
+    ('GET', '/health'): _health_route,
+    ('POST', '/health'): _health_route,
+}
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for API Gateway HTTP requests.
-    
+
     Args:
         event: API Gateway event containing HTTP request details
         context: Lambda context object
-        
+
     Returns:
         API Gateway formatted response
     """
     try:
-        # Extract HTTP method and path
-        http_method = event.get('httpMethod', event.get('requestContext', {}).get('http', {}).get('method', 'GET'))
-        path = event.get('path', event.get('rawPath', '/'))
-        path_parameters = event.get('pathParameters') or {}
+        http_method, path = _extract_method_and_path(event)
         query_string_parameters = event.get('queryStringParameters') or {}
-        
-        # Parse request body if present
-        body = None
-        if event.get('body'):
-            try:
-                body = json.loads(event['body'])
-            except json.JSONDecodeError:
-                body = event['body']
-        
-        # Build response data
-        response_data = {
-            'message': 'Hello from API Gateway Lambda!',
-            'method': http_method,
-            'path': path,
-            'pathParameters': path_parameters,
-            'queryParameters': query_string_parameters,
-            'body': body,
-            'headers': event.get('headers', {}),
-            'requestId': context.request_id if context else 'local-test'
-        }
-        
-        # Handle different routes
-        if path == '/health' or path == '/health/':
-            response_data['status'] = 'healthy'
-            status_code = 200
-        elif http_method == 'POST' and body:
-            response_data['message'] = 'POST request received successfully'
-            response_data['receivedData'] = body
-            status_code = 201
-        elif http_method == 'GET':
-            status_code = 200
-        else:
-            status_code = 200
-        
+
+        # Compact JSON by default; indented output costs ~2x the
+        # serialization CPU and 20-40% more response bytes, so it's
+        # opt-in for debugging via ?pretty=1
+        pretty = query_string_parameters.get('pretty') in ('1', 'true')
+
+        route = _ROUTES.get((http_method, path), _default_route)
+        status_code, response_data = route(event, context)
+
         # Return API Gateway formatted response
         return {
             'statusCode': status_code,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-            },
-            'body': json.dumps(response_data, indent=2)
+            'headers': _RESPONSE_HEADERS,
+            'body': dumps(response_data, indent=pretty)
         }
         
     except Exception as e:
         # Error handling
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json'
-            },
-            'body': json.dumps({
+            'headers': _ERROR_HEADERS,
+            'body': dumps({
                 'error': 'Internal server error',
                 'message': str(e)
             })
@@ -6,27 +6,297 @@ Shows AWS SDK usage and environment variable configuration.
 Loads credentials from .env file (local) or IAM role (AWS).
 """
 
-import json
+import asyncio
 import os
-from typing import Dict, Any, Optional
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Dict, Any, Optional, List
 import boto3
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from dotenv import load_dotenv
 
-# Load environment variables from .env file (for local testing)
-load_dotenv()
+try:
+    from lambda_functions._fastjson import dumps, dumps_bytes, loads
+except ImportError:
+    # Flat deployment package layout (handler files at the package root)
+    from _fastjson import dumps, dumps_bytes, loads
+
+# Load environment variables from .env file (for local testing only; in
+# Lambda both the dotenv import and the filesystem stat are wasted
+# cold-start time, so the module isn't even imported there)
+if not os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Initialize DynamoDB client
 # In AWS, credentials come from IAM role
 # Locally, credentials come from .env file or AWS credentials file
-dynamodb = boto3.resource(
+# The low-level client skips the resource layer's per-call Python
+# marshalling; items are converted once via TypeSerializer/Deserializer
+dynamodb = boto3.client(
     'dynamodb',
-    region_name=os.getenv('AWS_REGION', 'us-east-1')
+    region_name=os.getenv('AWS_REGION', 'us-east-1'),
+    config=Config(
+        max_pool_connections=50,
+        retries={'max_attempts': 3, 'mode': 'adaptive'},
+        tcp_keepalive=True,
+        # Client-side jsonschema-style validation is pure overhead for a
+        # trusted in-process caller; DynamoDB still validates server-side
+        parameter_validation=False
+    )
 )
 
 # Get table name from environment variable
 TABLE_NAME = os.getenv('DYNAMODB_TABLE_NAME', 'lambda-playground-table')
 
+# Operation aliases as frozensets: one hash probe per dispatch instead of
+# chained string equality tests
+_GET_OPS = frozenset({'GET', 'READ'})
+_PUT_OPS = frozenset({'PUT', 'CREATE', 'UPDATE'})
+_LIST_OPS = frozenset({'LIST', 'SCAN'})
+
+# Describe the table once at import to establish the HTTPS connection
+# during the INIT phase, so the first invocation reuses a warm socket.
+# Skipped outside Lambda so local imports stay offline.
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    try:
+        dynamodb.describe_table(TableName=TABLE_NAME)
+    except Exception:
+        # Table may not exist yet; the warm connection is still useful
+        pass
+
+# Serializers for converting between plain Python items and DynamoDB wire format
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _json_default(o: Any) -> Any:
+    """Serialize DynamoDB-specific types to natural JSON values.
+
+    DynamoDB hands back numbers as Decimal and string/number sets as
+    Python sets; the generic default=str would stringify both. Emit
+    real JSON numbers and lists instead (also smaller on the wire).
+    """
+    if isinstance(o, Decimal):
+        return int(o) if o % 1 == 0 else float(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def _resp(status: int, body: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a Lambda response with a JSON-serialized body."""
+    return {'statusCode': status, 'body': dumps(body, default=_json_default)}
+
+
+def _floats_to_decimal(value: Any) -> Any:
+    """Recursively convert floats to Decimal, which TypeSerializer requires.
+
+    orjson parses JSON numbers to plain floats; Decimal(str(f)) keeps the
+    shortest-repr value rather than the binary expansion.
+    """
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, list):
+        return [_floats_to_decimal(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _floats_to_decimal(v) for k, v in value.items()}
+    return value
+
+
+def _to_dynamo(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a plain Python item dict to DynamoDB wire format."""
+    return {k: _serializer.serialize(_floats_to_decimal(v)) for k, v in item.items()}
+
+
+def _from_dynamo(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a DynamoDB wire-format item back to a plain Python dict."""
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
+# DynamoDB caps BatchWriteItem at 25 items per request
+_BATCH_SIZE = 25
+_MAX_BATCH_RETRIES = 5
+
+
+def _batch_write_items(items: List[Dict[str, Any]]) -> List[Dict[str, int]]:
+    """
+    Write items in 25-item BatchWriteItem chunks.
+
+    Collapses N put_item round-trips into ceil(N/25) HTTP calls.
+    UnprocessedItems are re-submitted with exponential backoff instead of
+    falling back to one-by-one writes.
+
+    Args:
+        items: List of plain Python item dicts
+
+    Returns:
+        List of per-chunk results with requested/written/unprocessed counts
+    """
+    batches = []
+
+    for start in range(0, len(items), _BATCH_SIZE):
+        chunk = items[start:start + _BATCH_SIZE]
+        request_items = {
+            TABLE_NAME: [
+                {'PutRequest': {'Item': _to_dynamo(item)}}
+                for item in chunk
+            ]
+        }
+
+        attempt = 0
+        while True:
+            response = dynamodb.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items or attempt >= _MAX_BATCH_RETRIES:
+                break
+            time.sleep(0.05 * (2 ** attempt))
+            attempt += 1
+
+        unprocessed = sum(len(requests) for requests in request_items.values())
+        batches.append({
+            'requested': len(chunk),
+            'written': len(chunk) - unprocessed,
+            'unprocessed': unprocessed
+        })
+
+    return batches
+
+
+# Scan responses above this size get written to S3 and returned as a
+# presigned URL instead, staying clear of Lambda's 6 MB sync response cap
+_LARGE_RESPONSE_BYTES = 4 * 1024 * 1024
+_PRESIGNED_URL_TTL = 3600
+
+# S3 client for oversized responses, created lazily since most
+# invocations never need it
+_s3_client = None
+
+
+def _offload_to_s3(body_bytes: bytes) -> Optional[str]:
+    """
+    Write an oversized response body to S3 and return a presigned GET URL.
+
+    Args:
+        body_bytes: Serialized JSON response body
+
+    Returns:
+        Presigned URL, or None when S3_BUCKET_NAME isn't configured
+    """
+    global _s3_client
+    bucket = os.getenv('S3_BUCKET_NAME')
+    if not bucket:
+        return None
+
+    if _s3_client is None:
+        _s3_client = boto3.client('s3', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+
+    key = f'scan-results/{uuid.uuid4()}.json'
+    _s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body_bytes,
+        ContentType='application/json'
+    )
+    return _s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket, 'Key': key},
+        ExpiresIn=_PRESIGNED_URL_TTL
+    )
+
+
+# Parallel scan configuration: DynamoDB splits the table server-side by
+# segment, multiplying scan throughput up to the provisioned RCU
+_SCAN_SEGMENTS = 4
+_SCAN_PAGE_SIZE = 1000
+
+
+def _scan_segment(segment: int) -> List[Dict[str, Any]]:
+    """Scan one parallel segment to completion, paginating past the 1 MB cap."""
+    paginator = dynamodb.get_paginator('scan')
+    items = []
+    for page in paginator.paginate(
+        TableName=TABLE_NAME,
+        Segment=segment,
+        TotalSegments=_SCAN_SEGMENTS,
+        PaginationConfig={'PageSize': _SCAN_PAGE_SIZE}
+    ):
+        items.extend(page.get('Items', []))
+    return items
+
+
+# aioboto3 session is created lazily so the sync path never pays for the
+# import; reused across warm invocations once created
+_aio_session = None
+
+# Bound concurrent BatchWriteItem calls to avoid ProvisionedThroughputExceeded
+_ASYNC_CONCURRENCY = 8
+
+
+def _get_aio_session():
+    global _aio_session
+    if _aio_session is None:
+        import aioboto3
+        _aio_session = aioboto3.Session()
+    return _aio_session
+
+
+async def _batch_write_items_async(items: List[Dict[str, Any]]) -> List[Dict[str, int]]:
+    """
+    Write 25-item BatchWriteItem chunks concurrently via aioboto3.
+
+    Chunks are issued in parallel (bounded by a semaphore) so total wall
+    clock approaches the slowest chunk rather than the sum of all chunk
+    round-trips. UnprocessedItems are retried with the same exponential
+    backoff as the sync path.
+
+    Args:
+        items: List of plain Python item dicts
+
+    Returns:
+        List of per-chunk results with requested/written/unprocessed counts
+    """
+    session = _get_aio_session()
+    semaphore = asyncio.Semaphore(_ASYNC_CONCURRENCY)
+    chunks = [items[i:i + _BATCH_SIZE] for i in range(0, len(items), _BATCH_SIZE)]
+
+    async with session.client(
+        'dynamodb',
+        region_name=os.getenv('AWS_REGION', 'us-east-1')
+    ) as client:
+
+        async def _write(chunk):
+            request_items = {
+                TABLE_NAME: [
+                    {'PutRequest': {'Item': _to_dynamo(item)}}
+                    for item in chunk
+                ]
+            }
+
+            async with semaphore:
+                attempt = 0
+                while True:
+                    response = await client.batch_write_item(RequestItems=request_items)
+                    request_items = response.get('UnprocessedItems') or {}
+                    if not request_items or attempt >= _MAX_BATCH_RETRIES:
+                        break
+                    await asyncio.sleep(0.05 * (2 ** attempt))
+                    attempt += 1
+
+            unprocessed = sum(len(requests) for requests in request_items.values())
+            return {
+                'requested': len(chunk),
+                'written': len(chunk) - unprocessed,
+                'unprocessed': unprocessed
+            }
+
+        return list(await asyncio.gather(*[_write(chunk) for chunk in chunks]))
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -46,157 +316,187 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Dictionary with operation results
     """
     try:
-        # Get table reference
-        table = dynamodb.Table(TABLE_NAME)
-        
-        # Extract operation from event
-        operation = event.get('operation', event.get('httpMethod', 'GET')).upper()
-        
-        if operation == 'GET' or operation == 'READ':
+        # Extract operation from event (single lookup, uppercased once)
+        operation = (event.get('operation') or event.get('httpMethod') or 'GET').upper()
+
+        if operation in _GET_OPS:
             # Read item
             key = event.get('key', {})
             if not key:
-                return {
-                    'statusCode': 400,
-                    'body': json.dumps({
-                        'error': 'Key is required for GET operation',
-                        'event': event
-                    })
-                }
+                return _resp(400, {
+                    'error': 'Key is required for GET operation',
+                    'event': event
+                })
             
             try:
-                response = table.get_item(Key=key)
+                response = dynamodb.get_item(TableName=TABLE_NAME, Key=_to_dynamo(key))
                 item = response.get('Item')
-                
+
                 if item:
-                    return {
-                        'statusCode': 200,
-                        'body': json.dumps({
-                            'message': 'Item retrieved successfully',
-                            'item': item
-                        }, default=str)
-                    }
+                    return _resp(200, {
+                        'message': 'Item retrieved successfully',
+                        'item': _from_dynamo(item)
+                    })
                 else:
-                    return {
-                        'statusCode': 404,
-                        'body': json.dumps({
-                            'message': 'Item not found',
-                            'key': key
-                        })
-                    }
+                    return _resp(404, {
+                        'message': 'Item not found',
+                        'key': key
+                    })
             except ClientError as e:
-                return {
-                    'statusCode': 500,
-                    'body': json.dumps({
+                return _resp(500, {
+                    'error': 'DynamoDB error',
+                    'message': str(e)
+                })
+        
+        elif operation in _PUT_OPS:
+            # Batch path: write a list of items via BatchWriteItem
+            items = event.get('items')
+            if items:
+                if isinstance(items, str):
+                    items = loads(items)
+
+                try:
+                    # Optional high-fanout path: overlap chunk round-trips
+                    if event.get('async'):
+                        batches = asyncio.run(_batch_write_items_async(items))
+                    else:
+                        batches = _batch_write_items(items)
+                    written = sum(b['written'] for b in batches)
+                    unprocessed = sum(b['unprocessed'] for b in batches)
+                    return _resp(200 if not unprocessed else 207, {
+                        'message': f'Batch wrote {written} of {len(items)} item(s)',
+                        'written': written,
+                        'unprocessed': unprocessed,
+                        'batches': batches
+                    })
+                except ClientError as e:
+                    return _resp(500, {
                         'error': 'DynamoDB error',
                         'message': str(e)
                     })
-                }
-        
-        elif operation == 'PUT' or operation == 'CREATE' or operation == 'UPDATE':
-            # Create or update item
+
+            # Create or update a single item
             item = event.get('item', event.get('body', {}))
             
             # If body is a string, parse it
             if isinstance(item, str):
-                item = json.loads(item)
+                item = loads(item)
             
             if not item:
-                return {
-                    'statusCode': 400,
-                    'body': json.dumps({
-                        'error': 'Item data is required for PUT operation',
-                        'event': event
-                    })
-                }
+                return _resp(400, {
+                    'error': 'Item data is required for PUT operation',
+                    'event': event
+                })
             
             try:
-                table.put_item(Item=item)
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps({
-                        'message': 'Item created/updated successfully',
-                        'item': item
-                    }, default=str)
-                }
+                if event.get('rawDynamoJson'):
+                    # Pass-through fast path: the caller already sent the
+                    # item in DynamoDB wire shape ({'id': {'S': ...}}), so
+                    # skip the TypeSerializer pass and forward it as-is
+                    dynamodb.put_item(TableName=TABLE_NAME, Item=item)
+                else:
+                    dynamodb.put_item(TableName=TABLE_NAME, Item=_to_dynamo(item))
+                return _resp(200, {
+                    'message': 'Item created/updated successfully',
+                    'item': item
+                })
             except ClientError as e:
-                return {
-                    'statusCode': 500,
-                    'body': json.dumps({
-                        'error': 'DynamoDB error',
-                        'message': str(e)
-                    })
-                }
+                return _resp(500, {
+                    'error': 'DynamoDB error',
+                    'message': str(e)
+                })
         
         elif operation == 'DELETE':
             # Delete item
             key = event.get('key', {})
             if not key:
-                return {
-                    'statusCode': 400,
-                    'body': json.dumps({
-                        'error': 'Key is required for DELETE operation',
-                        'event': event
-                    })
-                }
+                return _resp(400, {
+                    'error': 'Key is required for DELETE operation',
+                    'event': event
+                })
             
             try:
-                response = table.delete_item(Key=key)
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps({
-                        'message': 'Item deleted successfully',
-                        'key': key
-                    })
-                }
+                dynamodb.delete_item(TableName=TABLE_NAME, Key=_to_dynamo(key))
+                return _resp(200, {
+                    'message': 'Item deleted successfully',
+                    'key': key
+                })
             except ClientError as e:
-                return {
-                    'statusCode': 500,
-                    'body': json.dumps({
-                        'error': 'DynamoDB error',
-                        'message': str(e)
-                    })
-                }
+                return _resp(500, {
+                    'error': 'DynamoDB error',
+                    'message': str(e)
+                })
         
-        elif operation == 'LIST' or operation == 'SCAN':
-            # List all items (scan)
+        elif operation in _LIST_OPS:
+            # List items via scan, paginating past DynamoDB's 1 MB response cap
             try:
-                response = table.scan()
-                items = response.get('Items', [])
-                
+                limit = event.get('limit', event.get('Limit'))
+                start_key = event.get('exclusiveStartKey', event.get('ExclusiveStartKey'))
+                last_key = None
+
+                if limit or start_key:
+                    # Cursor-based iteration: a caller-supplied cursor pins
+                    # the scan to a single segment, so no parallelism here
+                    kwargs = {'TableName': TABLE_NAME}
+                    if limit:
+                        kwargs['Limit'] = int(limit)
+                    if start_key:
+                        kwargs['ExclusiveStartKey'] = _to_dynamo(start_key)
+                    response = dynamodb.scan(**kwargs)
+                    raw_items = response.get('Items', [])
+                    last_key = response.get('LastEvaluatedKey')
+                else:
+                    # Full scan: fan out over parallel segments
+                    with ThreadPoolExecutor(max_workers=_SCAN_SEGMENTS) as executor:
+                        raw_items = [
+                            item
+                            for segment_items in executor.map(_scan_segment, range(_SCAN_SEGMENTS))
+                            for item in segment_items
+                        ]
+
+                items = [_from_dynamo(raw) for raw in raw_items]
+
+                body = {
+                    'message': f'Retrieved {len(items)} item(s)',
+                    'count': len(items),
+                    'items': items
+                }
+                if last_key:
+                    body['lastEvaluatedKey'] = _from_dynamo(last_key)
+
+                # Serialize to bytes once; for multi-MB results hand the
+                # payload off to S3 rather than doubling peak memory with
+                # another copy and risking the Lambda response limit
+                body_bytes = dumps_bytes(body, default=_json_default)
+                if len(body_bytes) > _LARGE_RESPONSE_BYTES:
+                    url = _offload_to_s3(body_bytes)
+                    if url:
+                        return _resp(200, {
+                            'message': f'Retrieved {len(items)} item(s)',
+                            'count': len(items),
+                            'location': url
+                        })
+
                 return {
                     'statusCode': 200,
-                    'body': json.dumps({
-                        'message': f'Retrieved {len(items)} item(s)',
-                        'count': len(items),
-                        'items': items
-                    }, default=str)
+                    'body': body_bytes.decode()
                 }
             except ClientError as e:
-                return {
-                    'statusCode': 500,
-                    'body': json.dumps({
-                        'error': 'DynamoDB error',
-                        'message': str(e)
-                    })
-                }
+                return _resp(500, {
+                    'error': 'DynamoDB error',
+                    'message': str(e)
+                })
         
         else:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'error': f'Unsupported operation: {operation}',
-                    'supportedOperations': ['GET', 'PUT', 'DELETE', 'LIST']
-                })
-            }
+            return _resp(400, {
+                'error': f'Unsupported operation: {operation}',
+                'supportedOperations': ['GET', 'PUT', 'DELETE', 'LIST']
+            })
     
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'message': str(e),
-                'tableName': TABLE_NAME
-            })
-        }
+        return _resp(500, {
+            'error': 'Internal server error',
+            'message': str(e),
+            'tableName': TABLE_NAME
+        })
 